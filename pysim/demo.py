@@ -8,14 +8,24 @@ A simple, editable 3D simulation demonstrating the use-case:
  - antidote injection and recovery animation
 
 Run with: python demo.py
-Dependencies: vpython
-Install: pip install vpython
+Dependencies: vpython, numpy (numba optional, JIT-compiles the particle kernel)
+Install: pip install vpython numpy numba
 """
 
 from vpython import *
-from random import random
-import time
+import numpy as np
 import math
+import time
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # plain Python fallback, same kernels just interpreted
+    HAVE_NUMBA = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 
 # ----------------------
 # Configurable parameters
@@ -30,6 +40,9 @@ CFG = {
     "recovery_time": 3.0,        # recovery duration
     "particle_speed": 1.2,
     "particle_lifetime": 3.5,
+    "sim_fps": 50,               # fixed physics/state-machine step rate
+    "render_fps": 25,            # how often scene updates are pushed to VPython
+    "snake_segments": 10,        # number of snake body samples
     "scene_scale": 1.0,
     "window_width": 1000,
     "window_height": 600
@@ -38,8 +51,9 @@ CFG = {
 # ----------------------
 # Helper utilities
 # ----------------------
+@njit("f8(f8)", cache=True)
 def ease_in_out(t):
-    return (1 - math.cos(math.pi * t)) / 2
+    return (1.0 - math.cos(math.pi * t)) * 0.5
 
 # ----------------------
 # Build scene
@@ -85,40 +99,162 @@ hr_bar = box(pos=vector(-3.6,0.9,0), size=vector(0.02,0.14,0.04), color=color.re
 hr_label = label(pos=vector(-3.6,0.98,0), text='Heart rate: -- bpm', box=False, height=12, color=color.white, opacity=0)
 
 # ----------------------
-# Snake model (simple chained spheres)
+# Snake model (one tapered curve through the segment centres)
 # ----------------------
-snake_segments = []
-nseg = 10
-for i in range(nseg):
-    radius = 0.12 - 0.003 * i
-    s = sphere(pos=vector(-6.0 + i*0.22, -0.55 + math.sin(i)*0.03, 0.02), radius=radius, color=vector(0.36,0.22,0.12))
-    snake_segments.append(s)
-snake_head = snake_segments[0]
+nseg = CFG["snake_segments"]
+seg_i = np.arange(nseg, dtype=np.float32)
+snake_offsets = seg_i * 0.22                  # segment spacing along x
+snake_pos = np.empty((nseg, 3), np.float32)   # SoA body positions (x is animated)
+snake_pos[:, 0] = -6.0 + snake_offsets
+snake_pos[:, 1] = -0.55 + np.sin(seg_i)*0.03
+snake_pos[:, 2] = 0.02
+snake_r = np.maximum(0.12 - 0.003 * seg_i, 0.02).tolist()
+snake = curve(color=vector(0.36,0.22,0.12))
+
+def place_snake(x):
+    """Move the snake head to ``x`` and push the whole body in one update."""
+    snake_pos[:, 0] = x + snake_offsets
+    snake.clear()
+    snake.append([{'pos': vector(*p), 'radius': r} for p, r in zip(snake_pos.tolist(), snake_r)])
+
+place_snake(-6.0)
 
 # ----------------------
-# Venom particles pool
+# Venom particles pool (Structure-of-Arrays; one points object is the view)
 # ----------------------
-particles = []
-for i in range(200):
-    p = sphere(pos=vector(100,100,100), radius=0.03, color=color.red, make_trail=False, opacity=0.95)
-    p.life = 0.0
-    p.v = vector(0,0,0)
-    p.active = False
-    particles.append(p)
-
-def emit_venom(origin, direction, count):
-    emitted = 0
-    for p in particles:
-        if not p.active:
-            p.pos = origin + vector((random()-0.5)*0.04, (random()-0.5)*0.04, (random()-0.5)*0.04)
-            jitter_dir = direction + vector((random()-0.5)*0.2, (random()-0.5)*0.2, (random()-0.5)*0.2)
-            p.v = norm(jitter_dir) * CFG["particle_speed"] * (0.8 + 0.6*random())
-            p.life = CFG["particle_lifetime"] * (0.6 + 0.8*random())
-            p.active = True
-            p.opacity = 0.95
-            emitted += 1
-            if emitted >= count:
-                break
+NPART = 200
+PARK = np.float32(100.0)     # off-screen parking spot for inactive particles
+
+# Particle state is float32 throughout: visual positions don't need FP64 and
+# it halves the bytes the integrator streams. CFG values are cast once here.
+_SPEED = np.float32(CFG["particle_speed"])
+_LIFETIME = np.float32(CFG["particle_lifetime"])
+_INV_LIFETIME = np.float32(1.0 / CFG["particle_lifetime"])
+_MAX_OPACITY = np.float32(0.95)
+
+pos = np.full((NPART, 3), PARK, np.float32)
+vel = np.zeros((NPART, 3), np.float32)
+life = np.zeros(NPART, np.float32)
+active = np.zeros(NPART, bool)
+
+# free-list of inactive slots: free_stack[:free_top] holds their indices
+free_stack = np.arange(NPART - 1, -1, -1, dtype=np.int32)
+free_top = NPART
+
+# Single renderer object for the whole pool: one update message per frame
+# instead of one per particle. Fading is done by blending the point color
+# towards the background since points carry no per-point opacity.
+particle_points = points(radius=0.03, size_units='world', color=color.red)   # same size as the old venom spheres
+VENOM_RGB = np.array((1.0, 0.0, 0.0), np.float32)
+BG_RGB = np.array((0.07, 0.07, 0.07), np.float32)
+
+# Explicit signature: compiled eagerly at import (before the scene animates)
+# and reloaded from the on-disk cache on later runs, so no JIT warm-up stall
+# ever lands inside the animation loop.
+@njit("i8(f4[:, ::1], f4[:, ::1], f4[::1], b1[::1], i4[::1], i8, i8, f4[::1], f4[::1],"
+      " f4, f4, f4, f4, f4, f4, f4[::1])", cache=True, fastmath=True)
+def tick_particles(pos, vel, life, active, free_stack, free_top, n_emit, origin, direction,
+                   speed, dt, damp, lifetime, inv_lifetime, drain, opacity):
+    """One fused particle pass: emit, integrate, age, fade and recycle.
+
+    ``n_emit`` new particles are popped off ``free_stack`` and launched from
+    ``origin`` along a jittered ``direction``. Every live particle is then
+    advanced by ``dt``; life decays at ``drain`` times the normal rate
+    (1.0 while venom spreads, faster during recovery). The new opacity of
+    live particles (life * ``inv_lifetime``, capped at 0.95) is written into
+    ``opacity`` and slots that died are
+    pushed back onto ``free_stack``. Returns the new ``free_top``.
+    """
+    for _ in range(min(n_emit, free_top)):
+        free_top -= 1
+        i = free_stack[free_top]
+        dx = direction[0] + (np.random.random() - 0.5) * 0.2
+        dy = direction[1] + (np.random.random() - 0.5) * 0.2
+        dz = direction[2] + (np.random.random() - 0.5) * 0.2
+        s = speed * (0.8 + 0.6*np.random.random()) / math.sqrt(dx*dx + dy*dy + dz*dz)
+        pos[i, 0] = origin[0] + (np.random.random() - 0.5) * 0.04
+        pos[i, 1] = origin[1] + (np.random.random() - 0.5) * 0.04
+        pos[i, 2] = origin[2] + (np.random.random() - 0.5) * 0.04
+        vel[i, 0] = dx * s
+        vel[i, 1] = dy * s
+        vel[i, 2] = dz * s
+        life[i] = lifetime * (0.6 + 0.8*np.random.random())
+        active[i] = True
+
+    for i in range(pos.shape[0]):
+        if not active[i]:
+            continue
+        for k in range(3):
+            pos[i, k] += vel[i, k] * dt
+            vel[i, k] *= damp           # simple dispersion
+        life[i] -= dt * drain
+        if life[i] <= 0.0:
+            active[i] = False
+            free_stack[free_top] = i
+            free_top += 1
+            for k in range(3):
+                pos[i, k] = 100.0
+            opacity[i] = 0.0
+        else:
+            opacity[i] = min(life[i] * inv_lifetime, _MAX_OPACITY)
+    return free_top
+
+def _tick_particles_numpy(pos, vel, life, active, free_stack, free_top, n_emit, origin, direction,
+                          speed, dt, damp, lifetime, inv_lifetime, drain, opacity):
+    """tick_particles as whole-array NumPy operations, for when numba is missing.
+
+    Interpreted, the kernel above would draw its random numbers and step the
+    pool one particle at a time; here both are batched.
+    """
+    n = min(n_emit, free_top)
+    if n:
+        free_top -= n
+        idx = free_stack[free_top:free_top + n][::-1]   # popped in the kernel's order
+        # one batched draw: [0:3] spawn offset, [3:6] direction jitter, [6] speed, [7] lifetime
+        r = np.random.random((n, 8)).astype(np.float32)
+        jdir = direction + (r[:, 3:6] - 0.5) * np.float32(0.2)
+        s = speed * (0.8 + 0.6*r[:, 6]) / np.linalg.norm(jdir, axis=1)
+        pos[idx] = origin + (r[:, 0:3] - 0.5) * np.float32(0.04)
+        vel[idx] = jdir * s[:, None]
+        life[idx] = lifetime * (0.6 + 0.8*r[:, 7])
+        active[idx] = True
+
+    live = np.nonzero(active)[0]
+    pos[live] += vel[live] * dt
+    vel[live] *= damp                   # simple dispersion
+    life[live] -= dt * drain
+    alive = life[live] > 0.0
+    dead, live = live[~alive], live[alive]
+    active[dead] = False
+    free_stack[free_top:free_top + len(dead)] = dead
+    free_top += len(dead)
+    pos[dead] = 100.0
+    opacity[dead] = 0.0
+    opacity[live] = np.minimum(life[live] * inv_lifetime, _MAX_OPACITY)
+    return free_top
+
+if not HAVE_NUMBA:
+    tick_particles = _tick_particles_numpy
+
+_opacity = np.zeros(NPART, np.float32)
+_shown = 0      # number of points currently held by particle_points
+
+def sync_particles():
+    """Push the live particles to the renderer in a single update.
+
+    Frames with nothing alive before or after (idle, approach, tail of
+    recovery) send no update at all.
+    """
+    global _shown
+    live = np.nonzero(active)[0]
+    if len(live) == 0 and _shown == 0:
+        return
+    cols = BG_RGB + (VENOM_RGB - BG_RGB) * _opacity[live, None]
+    particle_points.clear()
+    if len(live):
+        particle_points.append([{'pos': vector(*p), 'color': vector(*c)}
+                                for p, c in zip(pos[live].tolist(), cols.tolist())])
+    _shown = len(live)
 
 # ----------------------
 # State machine
@@ -127,12 +263,17 @@ state = "idle"
 t0 = 0.0
 clock = 0.0
 
+@njit("UniTuple(f8, 2)(f8)", cache=True)
+def _hr_geom(bpm):
+    # map typical bpm 40-160 to bar length 0.02 to 0.9; returns (length, x)
+    val = max(0.02, min(0.9, (bpm-40.0)/(160.0-40.0) * 0.9))
+    return val, -3.6 - (0.9 - val)/2.0
+
 # helper to update heart rate visualization (simple proxy)
 def set_heart_rate(bpm):
-    # map typical bpm 40-160 to bar length 0.02 to 0.9
-    val = max(0.02, min(0.9, (bpm-40)/(160-40) * 0.9))
+    val, x = _hr_geom(float(bpm))
     hr_bar.size.x = val
-    hr_bar.pos.x = -3.6 - (0.9 - val)/2.0
+    hr_bar.pos.x = x
     hr_label.text = f'Heart rate: {int(bpm)} bpm'
 
 set_heart_rate(75)
@@ -141,50 +282,74 @@ set_heart_rate(75)
 # Main simulation routine (non-blocking loop)
 # ----------------------
 def run_simulation():
-    global state, t0, clock, needle
+    global state, t0, clock, needle, free_top
     state = "approach"
     t0 = 0.0
     clock = 0.0
     bite_pos = wrist_center + vector(0.2, 0.05, 0.06)
-    detection_time_marker = None
+    bite_origin = np.array((bite_pos.x, bite_pos.y, bite_pos.z), np.float32)
+    bite_dir = np.zeros(3, np.float32)
+    detection_tick = None
     classification = None
 
+    # loop invariants
+    dt_local = 1.0 / CFG["sim_fps"]   # fixed timestep for predictability
+    # rendering is decoupled from simulation: push every Nth step only
+    render_every = max(1, int(round(CFG["sim_fps"] / CFG["render_fps"])))
+    dt32 = np.float32(dt_local)
+    damp32 = np.float32(1.0 - 0.05*dt_local)
+    emit_per_tick = max(1, int(CFG["venom_emit_count"] * dt_local * 8))
+    drain32 = np.float32(1.0)
+    approach_time = CFG["approach_time"]
+    bite_time = CFG["bite_time"]
+    classification_time = CFG["classification_time"]
+    injection_time = CFG["injection_time"]
+    recovery_time = CFG["recovery_time"]
+
+    tick = 0                # frame counter; drives tick-based timers
+    next_t = time.perf_counter()
     while True:
-        rate(50) # 50 frames per second
-        dt_local = 1.0 / 50.0   # fixed timestep for predictability
+        # sim_fps steps per second: deadline pacing instead of rate()'s bookkeeping
+        next_t += dt_local
+        wait = next_t - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
         t0 += dt_local
+        tick += 1
+        n_emit = 0
+        render = tick % render_every == 0
 
         # Animate snake approach
         if state == "approach":
-            progress = min(1.0, t0 / CFG["approach_time"])
-            x = -6.0 + (5.9 * ease_in_out(progress))
-            for i, seg in enumerate(snake_segments):
-                seg.pos.x = x + i*0.22
-            snake_head.pos = snake_segments[0].pos
+            progress = min(1.0, t0 / approach_time)
+            if render or progress >= 1.0:
+                place_snake(-6.0 + (5.9 * ease_in_out(progress)))
             if progress >= 1.0:
                 state = "bite"
                 t0 = 0.0
+                # arm and bite point are static during the bite: aim once
+                d = norm(arm.pos - bite_pos)
+                bite_dir = np.array((d.x, d.y, d.z), np.float32)
                 screen_label.text = "Bite!"
                 screen_label.color = color.yellow
 
         # Bite state: spawn venom particles for the bite duration
         elif state == "bite":
-            if t0 < CFG["bite_time"]:
-                # emit particles towards the arm (direction vector)
-                dir_vec = norm(arm.pos - bite_pos)
-                emit_venom(bite_pos, dir_vec, max(1, int(CFG["venom_emit_count"] * dt_local * 8)))
+            if t0 < bite_time:
+                # emit particles towards the arm (done inside tick_particles)
+                n_emit = emit_per_tick
                 screen_label.text = "Venom injected"
                 screen_label.color = color.orange
             else:
                 state = "venom_spread"
                 t0 = 0.0
-                detection_time_marker = time.time() + CFG["detection_delay"]
+                detection_tick = tick + int(round(CFG["detection_delay"] / dt_local))
                 screen_label.text = "Analyzing..."
                 screen_label.color = color.cyan
 
         # Venom spread: particles move into arm; wait for detection delay
         elif state == "venom_spread":
-            if time.time() >= detection_time_marker:
+            if tick >= detection_tick:
                 state = "classify"
                 t0 = 0.0
                 screen_label.text = "Classifying"
@@ -192,7 +357,7 @@ def run_simulation():
 
         # Classification (AI)
         elif state == "classify":
-            if t0 > CFG["classification_time"]:
+            if t0 > classification_time:
                 classification = "neurotoxic"  # for demo; could be random or parameterized
                 state = "inject"
                 t0 = 0.0
@@ -206,7 +371,7 @@ def run_simulation():
         # Injection animation
         elif state == "inject":
             # animate the needle moving into arm and cartridge shrinking
-            progress = min(1.0, t0 / CFG["injection_time"])
+            progress = min(1.0, t0 / injection_time)
             needle.axis = vector(-0.22*progress, 0, 0)
             needle.pos = wrist_center + vector(0.85 - 0.22*progress, -0.05, 0)
             # adjust cartridge axis to simulate depletion
@@ -221,14 +386,9 @@ def run_simulation():
         # Recovery
         elif state == "recover":
             # fade particles and slowly return heart rate to baseline
-            progress = min(1.0, t0 / CFG["recovery_time"])
-            # drain active particles faster
-            for p in particles:
-                if p.active:
-                    p.life -= dt_local * 1.4
-                    if p.life <= 0:
-                        p.active = False
-                        p.pos = vector(100,100,100)
+            progress = min(1.0, t0 / recovery_time)
+            # drain active particles faster (applied inside tick_particles)
+            drain32 = np.float32(1.0 + 1.4)
             # heart rate returns to baseline 75
             current_hr = 75 + (1.0-progress) * 20  # demo bounce back
             set_heart_rate(current_hr)
@@ -238,17 +398,12 @@ def run_simulation():
                 needle.visible = False
                 break
 
-        # Update particle motion every loop
-        for p in particles:
-            if p.active:
-                p.pos += p.v * dt_local
-                # simple dispersion
-                p.v = p.v * (1.0 - 0.05*dt_local)
-                p.life -= dt_local
-                p.opacity = max(0.0, p.life / CFG["particle_lifetime"])
-                if p.life <= 0:
-                    p.active = False
-                    p.pos = vector(100,100,100)
+        # Emit + update particle motion every loop, one pass over the pool
+        free_top = tick_particles(pos, vel, life, active, free_stack, free_top,
+                                  n_emit, bite_origin, bite_dir, _SPEED,
+                                  dt32, damp32, _LIFETIME, _INV_LIFETIME, drain32, _opacity)
+        if render:
+            sync_particles()
 
     # end simulation
     return
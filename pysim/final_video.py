@@ -1,20 +1,41 @@
 # Amrisha – Simple Cinematic Animation + Audio (Blender 3.x+)
 # Builds primitives, animates detection → nanodiamonds → quantum sensing → tailored antidote.
-# Auto-loads narration.wav + music.mp3 from the .blend folder (if present) and renders MP4.
+# Auto-loads narration.mp3 + music.mp3 from the .blend folder (if present) and renders MP4
+# (graded by ffmpeg after the render when ffmpeg is on PATH, else by a color-management look).
 
-import bpy, os, math
-from mathutils import Vector, Euler
+import bpy, bmesh, os, math, shutil, subprocess, time
+import numpy as np
 
 # ========= CONFIG =========
 OUTNAME = "amrisha.mp4"
+RAWNAME = "amrisha_ungraded.mkv"   # what Blender writes; finish_video() grades it into OUTNAME
+# Matroska while rendering: no moov atom to finalize, and a crashed render
+# still leaves a playable file. The MP4 is written by finish_video().
+# Contrast grade applied by ffmpeg after the render instead of a per-pixel
+# color-management look in Eevee
+GRADE = "eq=contrast=1.1:saturation=1.05"
 FPS = 30
 DURATION_SEC = 42
 TOTAL_FRAMES = FPS * DURATION_SEC
 RES_X, RES_Y = 1920, 1080
 
+# H.264 encode: REALTIME is Blender's fastest x264 speed preset, MEDIUM is CRF 23
+# (the x264 default). GOOD would be x264 "medium", several times slower to encode.
+FFMPEG_PRESET = 'REALTIME'
+CRF = 'MEDIUM'
+# The MKV is only a grading source, so it is kept visually lossless (CRF 17) and
+# the single lossy generation is the one finish_video() writes.
+RAW_CRF = 'PERC_LOSSLESS'
+# Blender's names for the above, as x264 options for finish_video()
+X264_PRESET = {'BEST': 'slower', 'GOOD': 'medium', 'REALTIME': 'superfast'}
+X264_CRF = {'LOSSLESS': 0, 'PERC_LOSSLESS': 17, 'HIGH': 20, 'MEDIUM': 23,
+            'LOW': 26, 'VERYLOW': 29, 'LOWEST': 32}
+
 # Audio files to auto-load if present beside the .blend
-NARRATION_FILE = "narration.wav"
+NARRATION_FILE = "narration.mp3"
 MUSIC_FILE = "music.mp3"
+MIX_FILE = "mix.wav"   # narration + music premixed by ffmpeg, when both are present
+MUSIC_VOLUME = 0.35
 
 # Key story beats (frames)
 F_THREAT_START   =  60      # snake enters
@@ -26,10 +47,25 @@ F_ANTIDOTE_START =  520     # tailored antidote delivery
 F_RECOVER        =  820
 F_END            =  TOTAL_FRAMES
 
+# Fixed rotations, computed once (bpy takes plain tuples for Euler/Vector props)
+R_UPRIGHT = (math.radians(90), 0.0, 0.0)   # arm, strap and captions stand up
+R_DEVICE  = (0.0, math.radians(20), 0.0)   # device body and screen tilt
+R_RIM     = (math.radians(-60), 0.0, math.radians(160))
+RIM_SPOT  = math.radians(60)
+ARM_SWAY  = math.radians(2)
+
 # ========= SCENE SETUP =========
 def reset_scene():
-    bpy.ops.wm.read_factory_settings(use_empty=True)
+    # Drop only the datablocks this script creates instead of reloading factory
+    # settings (UI, add-ons, preferences); batch_remove frees them in one pass.
+    bpy.data.batch_remove([d for coll in (bpy.data.objects, bpy.data.meshes, bpy.data.materials,
+                                          bpy.data.curves, bpy.data.lights, bpy.data.cameras,
+                                          bpy.data.actions, bpy.data.images, bpy.data.sounds)
+                           for d in coll])
+    _MAT_CACHE.clear()
     sc = bpy.context.scene
+    if sc.sequence_editor:
+        sc.sequence_editor_clear()
     sc.render.engine = 'BLENDER_EEVEE'
     sc.frame_start = 1
     sc.frame_end = TOTAL_FRAMES
@@ -37,15 +73,24 @@ def reset_scene():
     sc.render.resolution_x = RES_X
     sc.render.resolution_y = RES_Y
     sc.render.resolution_percentage = 100
+    # Only transforms and shader inputs change per frame: keep the uploaded
+    # geometry and compiled shaders alive across the animation
+    sc.render.use_persistent_data = True
 
     # Eevee look
     sc.eevee.use_bloom = True
     sc.eevee.bloom_intensity = 0.06
     sc.eevee.use_gtao = True
-    sc.eevee.use_ssr = True
-    sc.view_settings.look = 'Medium High Contrast'
+    sc.eevee.gtao_distance = 0.1   # scene is ~1 unit across; default AO reach is too wide
+    # No real glossy reflectors here, so skip SSR (the priciest post pass);
+    # the emissive/bloom look converges well within 32 render samples
+    sc.eevee.use_ssr = False
+    sc.eevee.taa_render_samples = 32
+    sc.eevee.taa_samples = 8
 
     # World
+    if sc.world is None:
+        sc.world = bpy.data.worlds.new("World")
     sc.world.use_nodes = True
     wn = sc.world.node_tree
     for n in wn.nodes: wn.nodes.remove(n)
@@ -54,19 +99,51 @@ def reset_scene():
     bg.inputs[0].default_value = (0.02, 0.02, 0.03, 1.0)
     wn.links.new(bg.outputs['Background'], out.inputs['Surface'])
 
-    # Output
+    # Output: the MKV grading source when ffmpeg is around to finish it, else the
+    # deliverable MP4 directly, with the contrast from a color-management look
     sc.render.image_settings.file_format = 'FFMPEG'
-    sc.render.ffmpeg.format = 'MPEG4'
     sc.render.ffmpeg.codec = 'H264'
-    sc.render.ffmpeg.constant_rate_factor = 'HIGH'
-    sc.render.ffmpeg.ffmpeg_preset = 'GOOD'
+    sc.render.ffmpeg.ffmpeg_preset = FFMPEG_PRESET
+    sc.render.ffmpeg.use_max_b_frames = False
     sc.render.ffmpeg.audio_codec = 'AAC'
     sc.render.ffmpeg.audio_bitrate = 192
-    sc.render.filepath = "//" + OUTNAME
+    if shutil.which("ffmpeg"):
+        sc.view_settings.look = 'None'   # contrast comes from GRADE in finish_video()
+        sc.render.ffmpeg.format = 'MKV'
+        sc.render.ffmpeg.constant_rate_factor = RAW_CRF
+        sc.render.filepath = "//" + RAWNAME
+    else:
+        print("ffmpeg not found on PATH; rendering", OUTNAME, "directly with a contrast look")
+        try:
+            sc.view_settings.look = 'Medium High Contrast'
+        except TypeError:   # 4.x: the looks belong to the AgX view transform
+            sc.view_settings.look = 'AgX - Medium High Contrast'
+        sc.render.ffmpeg.format = 'MPEG4'
+        sc.render.ffmpeg.constant_rate_factor = CRF
+        sc.render.filepath = "//" + OUTNAME
 
 # ========= MATERIALS =========
+# Factories are memoized on their parameters: identical materials are built
+# (and their Eevee shader compiled) once and shared by every caller.
+_MAT_CACHE = {}
+
+# Principled BSDF sockets renamed in Blender 4.0
+_BSDF_4X = {'Subsurface': 'Subsurface Weight', 'Specular': 'Specular IOR Level',
+            'Emission': 'Emission Color', 'Transmission': 'Transmission Weight'}
+
+def bsdf_input(node, name):
+    """Principled BSDF input by its 3.x name, falling back to the 4.x one."""
+    sock = node.inputs.get(name)
+    return sock if sock is not None else node.inputs[_BSDF_4X[name]]
+
 def mat_skin_with_hotspot():
-    """Skin with spherical gradient that we animate to show venom hot-spot + antidote fading."""
+    """Skin with spherical gradient that we animate to show venom hot-spot + antidote fading.
+
+    One Principled BSDF carries both the skin and the glow: the gradient drives
+    its emission strength and a keyed factor blends the emission from venom red
+    to antidote blue, so Eevee shades a single BSDF instead of two mix-shader
+    branches.
+    """
     m = bpy.data.materials.new("Skin")
     m.use_nodes = True
     nt = m.node_tree
@@ -77,7 +154,7 @@ def mat_skin_with_hotspot():
     out = nt.nodes.get("Material Output")
     bsdf = nt.nodes.new("ShaderNodeBsdfPrincipled")
     bsdf.inputs["Base Color"].default_value = (0.86, 0.68, 0.56, 1.0)
-    bsdf.inputs["Subsurface"].default_value = 0.15
+    bsdf_input(bsdf, "Subsurface").default_value = 0.15
     bsdf.inputs["Roughness"].default_value = 0.6
 
     tex = nt.nodes.new("ShaderNodeTexCoord")
@@ -87,37 +164,41 @@ def mat_skin_with_hotspot():
     ramp.color_ramp.elements[0].position = 0.35
     ramp.color_ramp.elements[1].position = 0.6
 
-    emit_red  = nt.nodes.new("ShaderNodeEmission"); emit_red.inputs['Color'].default_value  = (1.0, 0.08, 0.06, 1); emit_red.inputs['Strength'].default_value = 2.6
-    emit_blue = nt.nodes.new("ShaderNodeEmission"); emit_blue.inputs['Color'].default_value = (0.10, 0.55, 1.0, 1); emit_blue.inputs['Strength'].default_value = 3.2
-
-    mix1 = nt.nodes.new("ShaderNodeMixShader")
-    mix2 = nt.nodes.new("ShaderNodeMixShader")
+    glow = nt.nodes.new("ShaderNodeMath"); glow.operation = 'MULTIPLY'
+    glow.inputs[1].default_value = 3.0
+    tint = nt.nodes.new("ShaderNodeMixRGB")
+    tint.name = "VenomToAntidote"
+    tint.inputs['Color1'].default_value = (1.0, 0.08, 0.06, 1)   # venom red
+    tint.inputs['Color2'].default_value = (0.10, 0.55, 1.0, 1)   # antidote blue
+    tint.inputs['Fac'].default_value = 0.0
 
     nt.links.new(tex.outputs['Object'], mapn.inputs['Vector'])
     nt.links.new(mapn.outputs['Vector'], grad.inputs['Vector'])
     nt.links.new(grad.outputs['Fac'], ramp.inputs['Fac'])
+    nt.links.new(ramp.outputs['Color'], glow.inputs[0])
+    nt.links.new(glow.outputs['Value'], bsdf.inputs['Emission Strength'])
+    nt.links.new(tint.outputs['Color'], bsdf_input(bsdf, 'Emission'))
 
-    nt.links.new(bsdf.outputs['BSDF'], mix1.inputs[1])
-    nt.links.new(emit_red.outputs['Emission'], mix1.inputs[2])
-    nt.links.new(ramp.outputs['Color'], mix1.inputs['Fac'])
-
-    nt.links.new(mix1.outputs['Shader'], mix2.inputs[1])
-    nt.links.new(emit_blue.outputs['Emission'], mix2.inputs[2])
-    nt.links.new(ramp.outputs['Color'], mix2.inputs['Fac'])
-
-    nt.links.new(mix2.outputs['Shader'], out.inputs['Surface'])
+    nt.links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
     return m, mapn
 
 def mat_plastic(color=(0.12,0.12,0.12,1), name="Plastic"):
+    key = ("plastic", tuple(color))
+    if key in _MAT_CACHE:
+        return _MAT_CACHE[key]
     m = bpy.data.materials.new(name)
     m.use_nodes = True
     bsdf = m.node_tree.nodes.get("Principled BSDF")
     bsdf.inputs['Base Color'].default_value = color
     bsdf.inputs['Roughness'].default_value = 0.25
-    bsdf.inputs['Specular'].default_value = 0.5
+    bsdf_input(bsdf, 'Specular').default_value = 0.5
+    _MAT_CACHE[key] = m
     return m
 
 def mat_emission(color=(0.1,0.8,1,1), strength=6.0, name="Emit"):
+    key = ("emit", tuple(color), strength)
+    if key in _MAT_CACHE:
+        return _MAT_CACHE[key]
     m = bpy.data.materials.new(name)
     m.use_nodes = True
     nt = m.node_tree
@@ -129,9 +210,13 @@ def mat_emission(color=(0.1,0.8,1,1), strength=6.0, name="Emit"):
     em.inputs['Color'].default_value = color
     em.inputs['Strength'].default_value = strength
     nt.links.new(em.outputs['Emission'], out.inputs['Surface'])
+    _MAT_CACHE[key] = m
     return m
 
 def mat_glassish(color=(0.3,1.0,0.6,1), name="Glassish", alpha=0.2):
+    key = ("glass", tuple(color), alpha)
+    if key in _MAT_CACHE:
+        return _MAT_CACHE[key]
     m = bpy.data.materials.new(name)
     m.use_nodes = True
     nt = m.node_tree
@@ -143,73 +228,181 @@ def mat_glassish(color=(0.3,1.0,0.6,1), name="Glassish", alpha=0.2):
     tr  = nt.nodes.new("ShaderNodeBsdfTransparent")
     pr  = nt.nodes.new("ShaderNodeBsdfPrincipled")
     pr.inputs['Base Color'].default_value = color
-    pr.inputs['Transmission'].default_value = 0.7
+    bsdf_input(pr, 'Transmission').default_value = 0.7
     pr.inputs['Roughness'].default_value = 0.1
     mix.inputs['Fac'].default_value = alpha
     nt.links.new(tr.outputs['BSDF'], mix.inputs[1])
     nt.links.new(pr.outputs['BSDF'], mix.inputs[2])
     nt.links.new(mix.outputs['Shader'], out.inputs['Surface'])
     m.blend_method = 'BLEND'
+    m.shadow_method = 'NONE'   # a translucent shell shouldn't cost a shadow-map pass
+    _MAT_CACHE[key] = m
     return m
 
+# ========= MESH HELPERS =========
+# Geometry is built straight into bpy.data: every bpy.ops primitive call
+# re-evaluates the whole depsgraph, which made scene setup quadratic.
+def _ring_quads(n_rows, n_cols, wrap_rows=False, offset=0, flip=False):
+    """Quad indices for an (n_rows x n_cols) vertex grid wrapped along columns.
+
+    ``flip`` reverses the winding for grids whose rows run the other way round.
+    """
+    r = np.arange(n_rows if wrap_rows else n_rows - 1)[:, None]
+    c = np.arange(n_cols)[None, :]
+    r1 = (r + 1) % n_rows
+    c1 = (c + 1) % n_cols
+    q = np.stack((r*n_cols + c, r*n_cols + c1, r1*n_cols + c1, r1*n_cols + c), -1)
+    q = q.reshape(-1, 4) + offset
+    return (q[:, ::-1] if flip else q).tolist()
+
+def geo_cylinder(radius, depth, segments=32):
+    a = np.linspace(0, 2*np.pi, segments, endpoint=False)
+    ring = np.column_stack((radius*np.cos(a), radius*np.sin(a)))
+    verts = np.vstack((np.column_stack((ring, np.full(segments, -depth/2))),
+                       np.column_stack((ring, np.full(segments, depth/2)))))
+    faces = _ring_quads(2, segments)
+    faces += [list(range(segments))[::-1], list(range(segments, 2*segments))]
+    return verts.tolist(), faces
+
+def geo_torus(major_radius, minor_radius, major_segments=48, minor_segments=12):
+    u = np.linspace(0, 2*np.pi, major_segments, endpoint=False)[:, None]
+    v = np.linspace(0, 2*np.pi, minor_segments, endpoint=False)[None, :]
+    r = major_radius + minor_radius*np.cos(v)
+    z = np.broadcast_to(minor_radius*np.sin(v), (major_segments, minor_segments))
+    verts = np.stack((r*np.cos(u), r*np.sin(u), z), -1).reshape(-1, 3)
+    return verts.tolist(), _ring_quads(major_segments, minor_segments, wrap_rows=True, flip=True)
+
+def geo_cube(size):
+    h = size / 2
+    verts = [(x, y, z) for x in (-h, h) for y in (-h, h) for z in (-h, h)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    return verts, faces
+
+def geo_plane(size):
+    h = size / 2
+    return [(-h, -h, 0), (h, -h, 0), (h, h, 0), (-h, h, 0)], [(0, 1, 2, 3)]
+
+def geo_uv_sphere(radius, segments=32, rings=16):
+    th = np.linspace(0, np.pi, rings + 1)[1:-1, None]         # polar angle, poles excluded
+    ph = np.linspace(0, 2*np.pi, segments, endpoint=False)[None, :]
+    z = np.broadcast_to(radius*np.cos(th), (rings - 1, segments))
+    body = np.stack((radius*np.sin(th)*np.cos(ph), radius*np.sin(th)*np.sin(ph), z), -1).reshape(-1, 3)
+    verts = [(0.0, 0.0, radius)] + body.tolist() + [(0.0, 0.0, -radius)]
+    south = len(verts) - 1
+    last = 1 + (rings - 2)*segments
+    faces = [(0, 1 + k, 1 + (k + 1) % segments) for k in range(segments)]
+    faces += _ring_quads(rings - 1, segments, offset=1, flip=True)
+    faces += [(south, last + (k + 1) % segments, last + k) for k in range(segments)]
+    return verts, faces
+
+def geo_ico_sphere(radius, subdivisions=2):
+    # subdivided icosahedron: simplest to let bmesh do it, no operator involved
+    bm = bmesh.new()
+    bmesh.ops.create_icosphere(bm, subdivisions=subdivisions, radius=radius)
+    bm.verts.index_update()   # indices of freshly created verts are not valid yet
+    verts = [v.co[:] for v in bm.verts]
+    faces = [[v.index for v in f.verts] for f in bm.faces]
+    bm.free()
+    return verts, faces
+
+def link_object(ob, location=(0, 0, 0), rotation=None):
+    ob.location = location
+    if rotation is not None:
+        ob.rotation_euler = rotation
+    bpy.context.scene.collection.objects.link(ob)
+    return ob
+
+def make_mesh(name, geo):
+    verts, faces = geo
+    me = bpy.data.meshes.new(name)
+    me.from_pydata(verts, [], faces)
+    me.update()
+    return me
+
+def make_mesh_obj(name, geo, location=(0, 0, 0), rotation=None):
+    """geo is a (verts, faces) pair or an existing Mesh to share (linked duplicate)."""
+    me = geo if isinstance(geo, bpy.types.Mesh) else make_mesh(name, geo)
+    return link_object(bpy.data.objects.new(name, me), location, rotation)
+
+def make_empty(name, location):
+    ob = bpy.data.objects.new(name, None)
+    ob.empty_display_type = 'PLAIN_AXES'
+    return link_object(ob, location)
+
+def make_light(name, kind, location, rotation=None, **props):
+    li = bpy.data.lights.new(name, kind)
+    for k, v in props.items():
+        setattr(li, k, v)
+    return link_object(bpy.data.objects.new(name, li), location, rotation)
+
+def make_bezier_obj(name, points, location=(0, 0, 0), cyclic=False):
+    """points: [(co, handle_left, handle_right), ...] in object space."""
+    cu = bpy.data.curves.new(name, 'CURVE')
+    cu.dimensions = '3D'
+    sp = cu.splines.new('BEZIER')
+    sp.bezier_points.add(len(points) - 1)
+    for bp, (co, hl, hr) in zip(sp.bezier_points, points):
+        bp.co, bp.handle_left, bp.handle_right = co, hl, hr
+    sp.use_cyclic_u = cyclic
+    return link_object(bpy.data.objects.new(name, cu), location)
+
+def make_bezier_circle(name, radius):
+    k = radius * 0.5523  # handle length for a 4-point circle
+    pts = [((radius, 0, 0), (radius, -k, 0), (radius, k, 0)),
+           ((0, radius, 0), (k, radius, 0), (-k, radius, 0)),
+           ((-radius, 0, 0), (-radius, k, 0), (-radius, -k, 0)),
+           ((0, -radius, 0), (-k, -radius, 0), (k, -radius, 0))]
+    return make_bezier_obj(name, pts, cyclic=True)
+
 # ========= GEOMETRY =========
 def build_geometry():
     # Arm (cylinder)
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.12, depth=0.46, location=(0,0,0))
-    arm = bpy.context.active_object
-    arm.name = "Arm"
-    arm.rotation_euler = Euler((math.radians(90), 0, 0))
+    arm = make_mesh_obj("Arm", geo_cylinder(0.12, 0.46), rotation=R_UPRIGHT)
 
     # Strap (torus) + Device (cube) + Screen (plane)
-    bpy.ops.mesh.primitive_torus_add(major_radius=0.12, minor_radius=0.02, location=(0.0, 0.0, 0.05))
-    strap = bpy.context.active_object; strap.name="Strap"; strap.rotation_euler = Euler((math.radians(90),0,0))
-
-    bpy.ops.mesh.primitive_cube_add(size=0.065, location=(0.11, 0.0, 0.05))
-    device = bpy.context.active_object; device.name="Amrisha"; device.rotation_euler = Euler((0, math.radians(20), 0))
-
-    bpy.ops.mesh.primitive_plane_add(size=0.046, location=(0.14, 0.0, 0.05))
-    screen = bpy.context.active_object; screen.name="Screen"; screen.rotation_euler = Euler((0, math.radians(20), 0))
+    strap = make_mesh_obj("Strap", geo_torus(0.12, 0.02), (0.0, 0.0, 0.05), R_UPRIGHT)
+    device = make_mesh_obj("Amrisha", geo_cube(0.065), (0.11, 0.0, 0.05), R_DEVICE)
+    screen = make_mesh_obj("Screen", geo_plane(0.046), (0.14, 0.0, 0.05), R_DEVICE)
 
     # Device port (small circle where nanodiamonds appear)
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0.125, 0.0, 0.055))
-    port = bpy.context.active_object; port.name = "Inject_Port"
+    port = make_empty("Inject_Port", (0.125, 0.0, 0.055))
 
     # Bite target
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0.08, 0.0, 0.06))
-    bite = bpy.context.active_object; bite.name = "Bite"
+    bite = make_empty("Bite", (0.08, 0.0, 0.06))
 
     # Snake (curve + bevel)
-    bpy.ops.curve.primitive_bezier_curve_add(location=(-0.6,-0.4,0.06))
-    snake_path = bpy.context.active_object; snake_path.name="SnakePath"
-    pts = snake_path.data.splines[0].bezier_points
-    pts[0].co = Vector((-0.6,-0.4,0.06))
-    pts[0].handle_left  = pts[0].co + Vector((-0.2,-0.1,0))
-    pts[0].handle_right = pts[0].co + Vector((0.2,0.2,0))
-    pts[1].co = Vector((0.08,0.0,0.06))
-    pts[1].handle_left  = pts[1].co + Vector((-0.2,-0.2,0))
-    pts[1].handle_right = pts[1].co + Vector((0.2,0.2,0))
-    bpy.ops.curve.primitive_bezier_circle_add(radius=0.015)
-    snake_prof = bpy.context.active_object; snake_prof.name = "SnakeProfile"
+    snake_path = make_bezier_obj("SnakePath", [
+        ((-0.6,-0.4,0.06), (-0.8,-0.5,0.06), (-0.4,-0.2,0.06)),
+        ((0.08, 0.0,0.06), (-0.12,-0.2,0.06), (0.28, 0.2,0.06)),
+    ], location=(-0.6,-0.4,0.06))
+    # The animated bevel factor re-tessellates the tube every frame, so keep it
+    # coarse: 8 steps along the path, 4 per profile quadrant (16 around).
+    snake_prof = make_bezier_circle("SnakeProfile", 0.015)
+    snake_prof.data.resolution_u = 4
+    snake_path.data.bevel_mode = 'OBJECT'
     snake_path.data.bevel_object = snake_prof
-    snake_path.data.resolution_u = 24
+    snake_path.data.resolution_u = 8
 
     # Venom spheres (few small red emitters inside arm, near bite)
+    # All share one mesh datablock: identical geometry, only transforms differ.
+    venom_mesh = make_mesh("Venom", geo_uv_sphere(0.008))
     venom_spheres = []
     for i, off in enumerate([(0.07, 0.00, 0.06), (0.09, 0.02, 0.055), (0.10,-0.02, 0.062)]):
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.008, location=off)
-        s = bpy.context.active_object; s.name = f"Venom_{i}"
-        venom_spheres.append(s)
+        venom_spheres.append(make_mesh_obj(f"Venom_{i}", venom_mesh, off))
 
-    # Nanodiamond spheres (white/blue emitters start at device port)
+    # Nanodiamond spheres (white/blue emitters), shared mesh. They ride as
+    # children of one NanoSwarm empty, so the port->bite travel is keyed once
+    # on the empty; each sphere only keeps a small local offset in the cluster.
+    nano_mesh = make_mesh("Nano", geo_ico_sphere(0.005, subdivisions=2))
+    swarm = make_empty("NanoSwarm", port.location)
     nano_spheres = []
-    for i, off in enumerate([(0.125, 0.0, 0.055), (0.125, 0.005, 0.055), (0.125, -0.005, 0.055), (0.128, 0.0, 0.053)]):
-        bpy.ops.mesh.primitive_ico_sphere_add(radius=0.005, location=off, subdivisions=2)
-        n = bpy.context.active_object; n.name = f"Nano_{i}"
+    for i, off in enumerate([(0.0, 0.0, 0.0), (0.0, 0.005, 0.0), (0.0, -0.005, 0.0), (0.003, 0.0, -0.002)]):
+        n = make_mesh_obj(f"Nano_{i}", nano_mesh, off)
+        n.parent = swarm
         nano_spheres.append(n)
 
     # Antidote wave (transparent sphere that grows)
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.03, location=(0.11,0.0,0.05))
-    antidote_wave = bpy.context.active_object; antidote_wave.name = "AntidoteWave"
+    antidote_wave = make_mesh_obj("AntidoteWave", geo_uv_sphere(0.03), (0.11,0.0,0.05))
 
     return arm, strap, device, screen, port, bite, snake_path, snake_prof, venom_spheres, nano_spheres, antidote_wave
 
@@ -224,13 +417,12 @@ def assign_materials(arm, strap, device, screen, venom_spheres, nano_spheres, an
     screen_mat = mat_emission((0.08,0.8,1,1), strength=4.0, name="ScreenEmit")
     screen.data.materials.append(screen_mat)
 
+    # Venom / nano spheres share one mesh each, so one material slot covers all
     venom_mat = mat_emission((1.0,0.15,0.1,1), strength=8.0, name="VenomEmit")
-    for s in venom_spheres:
-        s.data.materials.append(venom_mat)
+    venom_spheres[0].data.materials.append(venom_mat)
 
     nano_mat = mat_emission((0.9,0.95,1.0,1), strength=6.5, name="NanoEmit")
-    for n in nano_spheres:
-        n.data.materials.append(nano_mat)
+    nano_spheres[0].data.materials.append(nano_mat)
 
     antidote_mat = mat_glassish((0.2,1.0,0.7,1), name="AntidoteGlass", alpha=0.6)
     antidote_wave.data.materials.append(antidote_mat)
@@ -238,6 +430,31 @@ def assign_materials(arm, strap, device, screen, venom_spheres, nano_spheres, an
     return mapping_node, screen_mat
 
 # ========= ANIMATION =========
+def bulk_keys(id_data, data_path, frames, values, index=0):
+    """Create one fcurve and load every (frame, value) key with a single foreach_set.
+
+    One C-level copy per channel instead of a keyframe_insert() round-trip
+    (RNA path lookup + depsgraph tag) per key.
+    """
+    ad = id_data.animation_data or id_data.animation_data_create()
+    if ad.action is None:
+        ad.action = bpy.data.actions.new(id_data.name + "Action")
+    fc = ad.action.fcurves.new(data_path, index=index)
+    n = len(frames)
+    fc.keyframe_points.add(n)
+    co = np.empty(2*n, dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    fc.keyframe_points.foreach_set("co", co)
+    fc.update()
+    return fc
+
+def bulk_keys_vec(id_data, data_path, frames, values):
+    """bulk_keys() for vector properties; values has shape (len(frames), channels)."""
+    values = np.asarray(values, dtype=np.float32)
+    for i in range(values.shape[1]):
+        bulk_keys(id_data, data_path, frames, values[:, i], index=i)
+
 def animate_snake(snake_path):
     d = snake_path.data
     d.bevel_factor_start = 1.0; d.bevel_factor_end = 1.0
@@ -257,120 +474,169 @@ def animate_screen(screen_mat):
         if n.type == 'EMISSION':
             em = n; break
     if not em: return
-    def set_em(c, s, f):
-        em.inputs['Color'].default_value = c
-        em.inputs['Strength'].default_value = s
-        em.inputs['Color'].keyframe_insert('default_value', frame=f)
-        em.inputs['Strength'].keyframe_insert('default_value', frame=f)
-
-    set_em((0.1,0.8,1.0,1), 3.0, 1)
-    set_em((1.0,0.12,0.08,1), 7.0, F_BITE)        # alert on bite
-    set_em((0.1,0.8,1.0,1), 4.0, F_DETECT_START) # back to active cyan
-    set_em((0.12,0.6,1.0,1), 9.0, F_SENSING_START)
-    set_em((0.15,0.9,0.7,1), 9.5, F_ANTIDOTE_START)  # antidote color
-    set_em((0.1,0.8,1.0,1), 4.0, F_RECOVER)
+    keys = [(1,                (0.1,0.8,1.0,1),   3.0),
+            (F_BITE,           (1.0,0.12,0.08,1), 7.0),   # alert on bite
+            (F_DETECT_START,   (0.1,0.8,1.0,1),   4.0),   # back to active cyan
+            (F_SENSING_START,  (0.12,0.6,1.0,1),  9.0),
+            (F_ANTIDOTE_START, (0.15,0.9,0.7,1),  9.5),   # antidote color
+            (F_RECOVER,        (0.1,0.8,1.0,1),   4.0)]
+
+    # The palette lives in a ColorRamp whose stops sit at each beat's position
+    # on the timeline; a single Value node sweeps 0..1 over the shot and picks
+    # the color. One scalar fcurve replaces four RGBA ones.
+    nt = screen_mat.node_tree
+    clock = nt.nodes.new("ShaderNodeValue"); clock.name = "ScreenClock"
+    ramp = nt.nodes.new("ShaderNodeValToRGB")
+    ramp.color_ramp.interpolation = 'EASE'
+    els = ramp.color_ramp.elements
+    els.remove(els[1])            # a new ramp has stops at 0 and 1; keep only the first
+    els[0].position = 0.0
+    els[0].color = keys[0][1]
+    for f, c, _ in keys[1:]:
+        els.new((f - 1) / (F_END - 1)).color = c
+    nt.links.new(clock.outputs['Value'], ramp.inputs['Fac'])
+    nt.links.new(ramp.outputs['Color'], em.inputs['Color'])
+
+    fc = bulk_keys(nt, clock.outputs['Value'].path_from_id('default_value'), (1, F_END), (0.0, 1.0))
+    for kp in fc.keyframe_points:
+        kp.interpolation = 'LINEAR'
+    bulk_keys(nt, em.inputs['Strength'].path_from_id('default_value'),
+              [k[0] for k in keys], [k[2] for k in keys])
 
 def animate_skin_hotspot(mapping_node):
     # Animate spherical gradient scale to imply venom growth then antidote fade
-    try:
-        mapping_node.inputs['Scale'].default_value = (0.35,0.35,0.35)
-        mapping_node.inputs['Scale'].keyframe_insert('default_value', frame=F_BITE)
-        mapping_node.inputs['Scale'].default_value = (0.05,0.05,0.05)
-        mapping_node.inputs['Scale'].keyframe_insert('default_value', frame=F_SENSING_START)
-        mapping_node.inputs['Scale'].default_value = (2.0,2.0,2.0)
-        mapping_node.inputs['Scale'].keyframe_insert('default_value', frame=F_RECOVER)
-    except Exception as e:
-        print("Mapping animation warning:", e)
+    nt = mapping_node.id_data
+    bulk_keys_vec(nt, mapping_node.inputs['Scale'].path_from_id('default_value'),
+                  (F_BITE, F_SENSING_START, F_RECOVER),
+                  [(0.35,0.35,0.35), (0.05,0.05,0.05), (2.0,2.0,2.0)])
+    # Glow turns from venom red to antidote blue as the antidote goes in
+    tint = nt.nodes["VenomToAntidote"]
+    bulk_keys(nt, tint.inputs['Fac'].path_from_id('default_value'),
+              (F_SENSING_START, F_ANTIDOTE_START), (0.0, 1.0))
 
 def animate_nanodiamonds(nano_spheres, port, bite):
-    # Four small spheres move from port to bite, staggered
-    start = F_ND_INJECT
+    # The swarm travels port -> mid (inside arm) -> bite; the spheres follow as children
+    swarm = nano_spheres[0].parent
+    # Read each location once; the path is then plain array arithmetic
+    path = np.empty((3, 3), dtype=np.float32)
+    path[0] = port.location
+    path[2] = bite.location
+    path[1] = (path[0] + path[2]) * 0.5
+    path[1, 0] += 0.02     # mid point bows out inside the arm
+    path[1, 1] = 0.0
     travel = 120
+    bulk_keys_vec(swarm, 'location', (F_ND_INJECT, F_ND_INJECT + travel//2, F_ND_INJECT + travel), path)
+    # Per-sphere jitter: one held key at the local z offset plus a noise
+    # modifier, each with its own phase so the spheres don't move in lockstep
     for i, n in enumerate(nano_spheres):
-        # start at port
-        n.location = port.location.copy()
-        n.keyframe_insert('location', frame=start + i*10)
-        # mid (inside arm)
-        mid = Vector(( (port.location.x + bite.location.x)/2 + 0.02,
-                       0.0 + (0.015 if i%2==0 else -0.015),
-                       (port.location.z + bite.location.z)/2 ))
-        n.location = mid
-        n.keyframe_insert('location', frame=start + i*10 + travel//2)
-        # end at bite
-        n.location = bite.location.copy()
-        n.keyframe_insert('location', frame=start + i*10 + travel)
-        # gentle fade outward after sensing
-        n.location = bite.location + Vector((0.02*(1 if i%2 else -1), 0.0, 0.0))
-        n.keyframe_insert('location', frame=F_SENSING_START + 80)
+        fc = bulk_keys(n, 'location', (F_ND_INJECT,), (n.location.z,), index=2)
+        noise = fc.modifiers.new('NOISE')
+        noise.scale = 12.0
+        noise.strength = 0.006
+        noise.phase = 1.0 + i*0.7
+        noise.offset = i*10
 
 def animate_antidote_wave(antidote_wave):
-    # Start small at device, grow through arm with transparency
-    antidote_wave.scale = Vector((0.01,0.01,0.01))
-    antidote_wave.keyframe_insert('scale', frame=F_ANTIDOTE_START)
-    antidote_wave.scale = Vector((2.2,2.2,2.2))
-    antidote_wave.keyframe_insert('scale', frame=F_RECOVER)
-    # Slight shrink to settle
-    antidote_wave.scale = Vector((1.8,1.8,1.8))
-    antidote_wave.keyframe_insert('scale', frame=F_END)
+    # Start small at device, grow through arm with transparency, slight shrink to settle
+    bulk_keys_vec(antidote_wave, 'scale', (F_ANTIDOTE_START, F_RECOVER, F_END),
+                  [(0.01,0.01,0.01), (2.2,2.2,2.2), (1.8,1.8,1.8)])
 
 def animate_arm_subtle(arm):
-    arm.rotation_euler = Euler((math.radians(90), 0, math.radians(-2)))
-    arm.keyframe_insert('rotation_euler', frame=1)
-    arm.rotation_euler = Euler((math.radians(90), 0, math.radians(2)))
-    arm.keyframe_insert('rotation_euler', frame=(F_RECOVER//2))
-    arm.rotation_euler = Euler((math.radians(90), 0, math.radians(-2)))
-    arm.keyframe_insert('rotation_euler', frame=F_END)
+    # Only Z sways; X stays at the static 90° set at build time. A cosine
+    # generator replaces the keys: -2° at frame 1, +2° at F_RECOVER//2, and on.
+    ad = arm.animation_data or arm.animation_data_create()
+    if ad.action is None:
+        ad.action = bpy.data.actions.new(arm.name + "Action")
+    fc = ad.action.fcurves.new('rotation_euler', index=2)
+    sway = fc.modifiers.new('FNGENERATOR')
+    sway.function_type = 'COS'
+    sway.amplitude = -ARM_SWAY
+    sway.phase_multiplier = math.pi / (F_RECOVER//2 - 1)
+    sway.phase_offset = -sway.phase_multiplier   # trough lands on frame 1
+
+# Camera path (cinematic but simple): frame, location xyz, rotation xyz in degrees
+CAM_KEYS = np.array([
+    (1,                  0.36, -0.56, 0.12,  85, 0, 20),
+    (F_BITE-10,          0.28, -0.48, 0.11,  84, 0, 18),
+    (F_SENSING_START,    0.30, -0.50, 0.11,  85, 0, 20),
+    (F_ANTIDOTE_START+60, 0.40, -0.50, 0.12, 82, 0, 24),
+    (F_END,              0.50, -0.46, 0.14,  80, 0, 28),
+], dtype=np.float32)
 
 def setup_lights_and_camera():
     # Lights
-    bpy.ops.object.light_add(type='AREA', location=(0.5, -0.4, 0.5)); key = bpy.context.active_object
-    key.data.energy = 2200; key.data.size = 0.45
-    bpy.ops.object.light_add(type='SPOT', location=(-0.5, 0.4, 0.55)); rim = bpy.context.active_object
-    rim.data.energy=1100; rim.data.spot_size=math.radians(60); rim.rotation_euler = Euler((math.radians(-60),0,math.radians(160)))
-
-    # Camera path (cinematic but simple)
-    bpy.ops.object.camera_add(location=(0.36,-0.56,0.12), rotation=(math.radians(85), 0, math.radians(20)))
-    cam = bpy.context.active_object; cam.data.lens = 60
-    def K(f, loc, rot):
-        cam.location = Vector(loc); cam.keyframe_insert('location', frame=f)
-        cam.rotation_euler = Euler(rot); cam.keyframe_insert('rotation_euler', frame=f)
-    K(1, (0.36,-0.56,0.12), (math.radians(85),0,math.radians(20)))
-    K(F_BITE-10, (0.28,-0.48,0.11), (math.radians(84),0,math.radians(18)))
-    K(F_SENSING_START, (0.30,-0.50,0.11), (math.radians(85),0,math.radians(20)))
-    K(F_ANTIDOTE_START+60, (0.40,-0.50,0.12), (math.radians(82),0,math.radians(24)))
-    K(F_END, (0.50,-0.46,0.14), (math.radians(80),0,math.radians(28)))
+    make_light("Key", 'AREA', (0.5, -0.4, 0.5), energy=2200, size=0.45)
+    make_light("Rim", 'SPOT', (-0.5, 0.4, 0.55), R_RIM,
+               energy=1100, spot_size=RIM_SPOT)
+
+    cam_data = bpy.data.cameras.new("Camera"); cam_data.lens = 60
+    frames, locs, rots = CAM_KEYS[:, 0], CAM_KEYS[:, 1:4], np.radians(CAM_KEYS[:, 4:7])
+    cam = link_object(bpy.data.objects.new("Camera", cam_data), locs[0], rots[0])
+    bulk_keys_vec(cam, 'location', frames, locs)
+    bulk_keys_vec(cam, 'rotation_euler', frames, rots)
     bpy.context.scene.camera = cam
 
 # ========= TEXT LABELS (optional) =========
-def add_floating_label(text, frame_in, frame_out, location=(0.0, -0.2, 0.2)):
-    bpy.ops.object.text_add(location=location)
-    t = bpy.context.active_object
-    t.data.body = text
-    t.data.extrude = 0.0
-    t.data.size = 0.035
-    t.rotation_euler = Euler((math.radians(90), 0, 0))
-    # Fade in/out via alpha: convert to mesh + add emission material
-    bpy.ops.object.convert(target='MESH')
-    m = mat_emission((1,1,1,1), strength=1.5, name=f"Label_{text}")
-    t.data.materials.append(m)
-    # Animate visibility via viewport alpha trick: scale up/down
-    t.scale = Vector((0.01,0.01,0.01)); t.keyframe_insert('scale', frame=frame_in-10)
-    t.scale = Vector((1,1,1)); t.keyframe_insert('scale', frame=frame_in+5)
-    t.scale = Vector((1,1,1)); t.keyframe_insert('scale', frame=frame_out-5)
-    t.scale = Vector((0.01,0.01,0.01)); t.keyframe_insert('scale', frame=frame_out)
-    return t
+# Brief technical captions: text, frame in, frame out, x offset
+LABELS = np.array([
+    ("Detection: Physiological Anomalies",     F_DETECT_START,   F_DETECT_START+120,   0.0),
+    ("Nanodiamonds Deployed",                  F_ND_INJECT,      F_ND_INJECT+120,      0.0),
+    ("Quantum Sensing: Toxin Typing",          F_SENSING_START,  F_SENSING_START+140,  0.0),
+    ("Tailored Antidote Delivery",             F_ANTIDOTE_START, F_ANTIDOTE_START+160, 0.0),
+    ("Amrisha — Smart. Quantum. Life-saving.", F_RECOVER,        F_END-10,            -0.02),
+], dtype=[("text", "U64"), ("frame_in", "i4"), ("frame_out", "i4"), ("x", "f4")])
+
+def add_floating_labels(labels=LABELS, y=-0.22, z=0.18):
+    # One font curve carries the shared settings and material; each label is a
+    # copy with its own body. Kept as text objects: no convert-to-mesh needed.
+    proto = bpy.data.curves.new("Label", 'FONT')
+    proto.extrude = 0.0
+    proto.size = 0.035
+    proto.materials.append(mat_emission((1,1,1,1), strength=1.5, name="Label"))
+    out = []
+    for text, frame_in, frame_out, x in labels.tolist():
+        cu = proto.copy(); cu.name = f"Label_{text}"
+        cu.body = text
+        t = link_object(bpy.data.objects.new(f"Label_{text}", cu), (x, y, z), R_UPRIGHT)
+        # Toggle visibility rather than scaling to near-zero: a hidden label is
+        # skipped by the depsgraph and the renderer instead of being evaluated tiny
+        for prop in ('hide_viewport', 'hide_render'):
+            fc = bulk_keys(t, prop, (frame_in-1, frame_in, frame_out), (1.0, 0.0, 1.0))
+            for kp in fc.keyframe_points:
+                kp.interpolation = 'CONSTANT'
+        out.append(t)
+    bpy.data.curves.remove(proto)
+    return out
 
 # ========= AUDIO (VSE) =========
+def premix_audio(narration, music, out):
+    """Mix narration and ducked music into one WAV with ffmpeg, once, so the
+    render's muxer only has a single strip to resample instead of mixing two."""
+    subprocess.check_call([
+        shutil.which("ffmpeg"), "-y", "-loglevel", "error", "-i", narration, "-i", music,
+        "-filter_complex", f"[1:a]volume={MUSIC_VOLUME}[m];[0:a][m]amix=inputs=2:duration=longest:normalize=0[a]",
+        "-map", "[a]", "-c:a", "pcm_s16le", out])
+
 def add_audio_to_vse(narration_rel, music_rel):
     sc = bpy.context.scene
     if not sc.sequence_editor:
         sc.sequence_editor_create()
+    strips = sc.sequence_editor.sequences
     base = bpy.path.abspath("//") or os.getcwd()
     nar = os.path.join(base, narration_rel) if narration_rel else None
     mus = os.path.join(base, music_rel) if music_rel else None
+    if nar and mus and os.path.exists(nar) and os.path.exists(mus) and shutil.which("ffmpeg"):
+        mix = os.path.join(base, MIX_FILE)
+        try:
+            premix_audio(nar, mus, mix)
+            strips.new_sound("Mix", mix, channel=1, frame_start=1)
+            print("Added premixed narration + music:", mix)
+            return
+        except Exception as e:
+            print("Premix failed, mixing in the VSE instead:", e)
     if nar and os.path.exists(nar):
         try:
-            bpy.ops.sequencer.sound_strip_add(filepath=nar, frame_start=1, channel=1)
+            strips.new_sound("Narration", nar, channel=1, frame_start=1)
             print("Added narration:", nar)
         except Exception as e:
             print("Narration add failed:", e)
@@ -378,17 +644,113 @@ def add_audio_to_vse(narration_rel, music_rel):
         print("Narration not found:", nar)
     if mus and os.path.exists(mus):
         try:
-            bpy.ops.sequencer.sound_strip_add(filepath=mus, frame_start=1, channel=2)
             # Lower BG music
-            for s in sc.sequence_editor.sequences_all:
-                if s.type == 'SOUND' and os.path.basename(mus) in s.filepath:
-                    s.volume = 0.35
+            strips.new_sound("Music", mus, channel=2, frame_start=1).volume = MUSIC_VOLUME
             print("Added music:", mus)
         except Exception as e:
             print("Music add failed:", e)
     else:
         print("Music not found:", mus)
 
+# ========= PARALLEL RENDER =========
+def render_parallel(n=max(1, (os.cpu_count() or 2)//2), gpus=None):
+    """Render the saved .blend as n headless Blender workers over contiguous frame
+    ranges as PNG frames, then encode them once, graded and with a single audio
+    mixdown, in finish_video().
+
+    gpus: optional list of CUDA device ids; worker i is pinned to gpus[i % len(gpus)].
+    Run after main() and saving the file. Functions from a Text Editor run are not
+    in the Python console's namespace, so load the script text as a module there:
+        bpy.data.texts["final_video.py"].as_module().render_parallel()
+    """
+    if not bpy.data.filepath:
+        raise RuntimeError("Save the .blend first: workers render from the file on disk")
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError("ffmpeg not found on PATH")
+    bpy.ops.wm.save_mainfile()
+    sc = bpy.context.scene
+    base = bpy.path.abspath("//")
+    frames_dir = os.path.join(base, "frames")
+    os.makedirs(frames_dir, exist_ok=True)
+
+    # Still frames split cleanly at any boundary, unlike encoded movie parts,
+    # and the one encode at the end sees the whole shot.
+    frames = sc.frame_end - sc.frame_start + 1
+    procs = []
+    for i in range(n):
+        s = sc.frame_start + i*frames//n
+        e = sc.frame_start + (i+1)*frames//n - 1
+        env = dict(os.environ)
+        if gpus:
+            env["CUDA_VISIBLE_DEVICES"] = str(gpus[i % len(gpus)])
+        procs.append(subprocess.Popen([
+            bpy.app.binary_path, "-b", bpy.data.filepath, "-noaudio",
+            "-o", os.path.join(frames_dir, "frame_######"), "-F", "PNG", "-x", "1",
+            "-s", str(s), "-e", str(e), "-a"], env=env))
+    # Stop every sibling as soon as one worker fails (or on Ctrl+C), then reap
+    # them all so no Blender process outlives this call.
+    try:
+        while any(p.poll() is None for p in procs) and not any(p.returncode for p in procs):
+            time.sleep(0.5)
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.terminate()
+        codes = [p.wait() for p in procs]
+    if any(codes):
+        raise RuntimeError("a render worker failed; see its log above")
+
+    audio = None
+    if sc.sequence_editor and sc.sequence_editor.sequences_all:
+        audio = os.path.join(frames_dir, "audio.flac")
+        bpy.ops.sound.mixdown(filepath=audio, check_existing=False, container='FLAC', codec='FLAC')
+    finish_video(os.path.join(frames_dir, "frame_%06d.png"), audio,
+                 src_args=("-framerate", str(FPS), "-start_number", str(sc.frame_start)))
+
+# ========= POST =========
+def finish_video(src, audio=None, src_args=()):
+    """Apply GRADE to a rendered movie (or image sequence) and write OUTNAME
+    beside the .blend.
+
+    audio, if given, replaces the source's own audio track; src_args are ffmpeg
+    input options for src, e.g. the frame rate of an image sequence.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        print("ffmpeg not found on PATH; ungraded render left at", src)
+        return
+    out = os.path.join(bpy.path.abspath("//") or os.getcwd(), OUTNAME)
+    cmd = [ffmpeg, "-y", *src_args, "-i", src]
+    if audio:
+        cmd += ["-i", audio, "-map", "0:v", "-map", "1:a", "-shortest"]
+    cmd += ["-vf", GRADE, "-c:v", "libx264", "-preset", X264_PRESET[FFMPEG_PRESET],
+            "-crf", str(X264_CRF[CRF]), "-pix_fmt", "yuv420p"]
+    cmd += ["-c:a", "aac", "-b:a", "192k"] if audio else ["-c:a", "copy"]
+    cmd += ["-movflags", "+faststart", out]
+    subprocess.check_call(cmd)
+    print("Rendered:", out)
+
+# render_complete also fires after an F12 still; count the frames of each render
+# so only an animation render (more than one frame) is graded.
+# The handlers live only in the Blender session that ran main(): a saved .blend
+# rendered later (e.g. blender -b file.blend -a) leaves RAWNAME ungraded. Grade
+# it from that file's Python console with
+#     bpy.data.texts["final_video.py"].as_module().finish_video(bpy.path.abspath("//" + RAWNAME))
+_RENDERED_FRAMES = [0]
+
+def _count_render_init(scene, *_):
+    _RENDERED_FRAMES[0] = 0
+
+def _count_render_post(scene, *_):
+    _RENDERED_FRAMES[0] += 1
+
+def _finish_after_render(scene, *_):
+    if not scene.render.is_movie_format or _RENDERED_FRAMES[0] < 2:
+        return
+    src = bpy.path.abspath(scene.render.frame_path(frame=scene.frame_start))
+    if os.path.basename(src) == RAWNAME and os.path.exists(src):
+        finish_video(src)
+
 # ========= MAIN =========
 def main():
     reset_scene()
@@ -410,17 +772,21 @@ def main():
     setup_lights_and_camera()
 
     # Labels (brief technical captions)
-    add_floating_label("Detection: Physiological Anomalies", F_DETECT_START, F_DETECT_START+120, location=(0.0,-0.22,0.18))
-    add_floating_label("Nanodiamonds Deployed", F_ND_INJECT, F_ND_INJECT+120, location=(0.0,-0.22,0.18))
-    add_floating_label("Quantum Sensing: Toxin Typing", F_SENSING_START, F_SENSING_START+140, location=(0.0,-0.22,0.18))
-    add_floating_label("Tailored Antidote Delivery", F_ANTIDOTE_START, F_ANTIDOTE_START+160, location=(0.0,-0.22,0.18))
-    add_floating_label("Amrisha — Smart. Quantum. Life-saving.", F_RECOVER, F_END-10, location=(-0.02,-0.22,0.18))
+    add_floating_labels()
 
     # Audio (optional but automatic if files exist)
     add_audio_to_vse(NARRATION_FILE, MUSIC_FILE)
 
-    print("Amrisha scene ready. Render → Render Animation (Ctrl+F12)")
-    print("Output:", bpy.context.scene.render.filepath)
+    # Grade the movie once Ctrl+F12 finishes (replacing handlers from a previous run)
+    for handlers, fn in ((bpy.app.handlers.render_init, _count_render_init),
+                         (bpy.app.handlers.render_post, _count_render_post),
+                         (bpy.app.handlers.render_complete, _finish_after_render)):
+        handlers[:] = [h for h in handlers if h.__name__ != fn.__name__]
+        if shutil.which("ffmpeg"):
+            handlers.append(fn)
+
+    print("Amrisha scene ready. Render → Render Animation (Ctrl+F12), or save and run render_parallel()")
+    print("Output:", "//" + OUTNAME)
 
 if __name__ == "__main__":
     main()
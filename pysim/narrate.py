@@ -1,6 +1,12 @@
-# generate_narration.py
+# narrate.py
+import hashlib, os, re, time
+from concurrent.futures import ThreadPoolExecutor
 from gtts import gTTS
 
+OUT = "narration.mp3"   # gTTS returns MP3 data; name it for what it is
+LANG, SLOW = "en", True
+CACHE_DIR = os.path.expanduser("~/.cache/amrisha_tts")
+
 text = (
 "A venomous strike. "
 "Poison begins spreading silently through the bloodstream. "
@@ -12,6 +18,39 @@ text = (
 "Venom neutralized. Life preserved. "
 "Amrisha — smart. Quantum. Life-saving."
 )
-tts = gTTS(text=text, lang="en", slow=True)
-tts.save("narration.wav")
-print("Saved narration.wav")
+# Synthesis is a network round-trip to Google per request. Sentences are
+# fetched a few at a time (the endpoint answers bursts with HTTP 429), retried
+# with backoff, and cached by content so unchanged sentences are never fetched again.
+WORKERS, RETRIES = 3, 4
+
+def synthesize(sentence):
+    key = hashlib.blake2b(f"{sentence}|{LANG}|slow={SLOW}".encode(), digest_size=16).hexdigest()
+    cached = os.path.join(CACHE_DIR, key + ".mp3")
+    if not os.path.exists(cached):
+        for attempt in range(RETRIES):
+            try:
+                gTTS(text=sentence, lang=LANG, slow=SLOW).save(cached + ".part")
+                os.replace(cached + ".part", cached)
+                break
+            except Exception:   # HTTP errors, timeouts, disk errors: all worth a retry
+                if os.path.exists(cached + ".part"):
+                    os.remove(cached + ".part")
+                if attempt == RETRIES - 1:
+                    raise
+                time.sleep(2 ** attempt)
+    return cached
+
+sentences = [s for s in re.split(r"(?<=[.!?…])\s+", text) if s.strip()]
+os.makedirs(CACHE_DIR, exist_ok=True)
+# Each distinct sentence is fetched once: two workers on the same sentence
+# would write the same .part file
+unique = list(dict.fromkeys(sentences))
+with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+    clips = dict(zip(unique, pool.map(synthesize, unique)))
+parts = [clips[s] for s in sentences]
+# MP3 is a plain frame stream, so the clips join by appending bytes
+with open(OUT, "wb") as out:
+    for part in parts:
+        with open(part, "rb") as f:
+            out.write(f.read())
+print("Saved", OUT)